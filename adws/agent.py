@@ -4,24 +4,54 @@ This module assumes Claude Code CLI is already installed and authenticated.
 It uses the same environment as the terminal - no API keys needed.
 """
 
+import asyncio
+import hashlib
 import subprocess
 import sys
 import os
-import json
 import re
+import shutil
+import tempfile
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any, Tuple
 from data_types import (
     AgentPromptRequest,
     AgentPromptResponse,
     AgentTemplateRequest,
 )
+from git_actions import get_head_sha, has_changes
+from models.serialization import ArrayWriter, ensure_dir, iter_lines_file, loads
 
 # Get Claude Code CLI path from environment or use default
 CLAUDE_PATH = os.getenv("CLAUDE_CODE_PATH", "claude")
 
+# Upper bound on Claude Code subprocesses run at once by the parallel helpers
+MAX_CONCURRENCY = int(os.getenv("ADW_MAX_CONCURRENCY", "4"))
 
+# Response cache location and max age for requests with cache enabled
+CACHE_DIR = os.getenv(
+    "ADW_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "adw")
+)
+CACHE_TTL_SECONDS = int(os.getenv("ADW_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Directory under the working directory that ADW writes its own output to
+# (template raw output, cache prefixes); ignored when deciding whether the
+# repository is clean enough to cache a response
+ADW_OUTPUT_DIR = "agents"
+
+# Leading slash command of a prompt, e.g. "/feature"
+_SLASH_COMMAND_RE = re.compile(r'^(/\w+)')
+
+
+@lru_cache(maxsize=1)
 def check_claude_installed() -> Optional[str]:
-    """Check if Claude Code CLI is installed. Return error message if not."""
+    """Check if Claude Code CLI is installed. Return error message if not.
+
+    The probe runs once per process; CLAUDE_PATH is fixed at import time.
+    Call check_claude_installed.cache_clear() to probe again.
+    """
     try:
         result = subprocess.run(
             [CLAUDE_PATH, "--version"], capture_output=True, text=True
@@ -40,29 +70,47 @@ def parse_jsonl_output(output_file: str) -> Tuple[List[Dict[str, Any]], Optional
         Tuple of (all_messages, result_message) where result_message is None if not found
     """
     try:
-        with open(output_file, "r") as f:
-            messages = [json.loads(line) for line in f if line.strip()]
-
-            result_message = None
-            for message in reversed(messages):
-                if message.get("type") == "result":
-                    result_message = message
-                    break
-
-            return messages, result_message
+        messages = []
+        result_message = None
+        for message in iter_lines_file(output_file):
+            messages.append(message)
+            if message.get("type") == "result":
+                result_message = message
+
+        return messages, result_message
     except Exception as e:
         print(f"Error parsing JSONL file: {e}", file=sys.stderr)
         return [], None
 
 
-def convert_jsonl_to_json(jsonl_file: str) -> str:
-    """Convert JSONL file to JSON array file."""
+def _convert_jsonl(jsonl_file: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Stream a JSONL file into its JSON array sibling in a single pass.
+
+    Returns:
+        Tuple of (json_file, result_message) where result_message is the last
+        message of type "result", or None if not found
+    """
     json_file = jsonl_file.replace('.jsonl', '.json')
-    messages, _ = parse_jsonl_output(jsonl_file)
+    result_message = None
 
-    with open(json_file, 'w') as f:
-        json.dump(messages, f, indent=2)
+    with open(json_file, 'wb') as f:
+        writer = ArrayWriter(f)
+        try:
+            for message in iter_lines_file(jsonl_file):
+                if message.get("type") == "result":
+                    result_message = message
+                writer.write(message)
+        except Exception as e:
+            print(f"Error parsing JSONL file: {e}", file=sys.stderr)
+            result_message = None
+        writer.finish()
+
+    return json_file, result_message
 
+
+def convert_jsonl_to_json(jsonl_file: str) -> str:
+    """Convert JSONL file to JSON array file."""
+    json_file, _ = _convert_jsonl(jsonl_file)
     return json_file
 
 
@@ -76,6 +124,14 @@ def get_claude_env() -> Optional[Dict[str, str]]:
     return None
 
 
+@lru_cache(maxsize=1024)
+def _agent_dir(output_dir: str, agent_id: str, agent_name: str) -> str:
+    """Return {output_dir}/{agent_id}/{agent_name}, creating it on first use."""
+    agent_dir = os.path.join(output_dir, agent_id, agent_name)
+    ensure_dir(agent_dir)
+    return agent_dir
+
+
 def save_prompt(prompt: str, agent_id: str, agent_name: str, output_dir: str) -> Optional[str]:
     """Save a prompt to the logging directory.
 
@@ -89,14 +145,14 @@ def save_prompt(prompt: str, agent_id: str, agent_name: str, output_dir: str) ->
         Path to saved prompt file, or None if not saved
     """
     # Extract slash command from prompt
-    match = re.match(r'^(/\w+)', prompt)
+    match = _SLASH_COMMAND_RE.match(prompt)
     if not match:
         return None
 
     command_name = match.group(1)[1:]  # Remove leading slash
 
-    prompt_dir = os.path.join(output_dir, agent_id, agent_name, "prompts")
-    os.makedirs(prompt_dir, exist_ok=True)
+    prompt_dir = os.path.join(_agent_dir(output_dir, agent_id, agent_name), "prompts")
+    ensure_dir(prompt_dir)
 
     prompt_file = os.path.join(prompt_dir, f"{command_name}.txt")
     with open(prompt_file, "w") as f:
@@ -105,6 +161,254 @@ def save_prompt(prompt: str, agent_id: str, agent_name: str, output_dir: str) ->
     return prompt_file
 
 
+def _write_cache_prefix(prefix: str, agent_name: str, cwd: str) -> str:
+    """Persist a static prompt prefix at a content-addressed per-agent path.
+
+    The file name is derived from the prefix itself, so concurrent requests
+    with different prefixes never share a file, and an existing file is
+    never rewritten: repeated runs hand Claude the exact same bytes and hit
+    the prompt cache. New files are written to a temp file and renamed into
+    place, so readers never see a partial prefix.
+
+    Returns:
+        Path to agents/{agent_name}/cache_prefix-{digest}.md under cwd
+    """
+    data = prefix.encode("utf-8")
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    prefix_dir = os.path.join(cwd, ADW_OUTPUT_DIR, agent_name)
+    prefix_file = os.path.join(prefix_dir, f"cache_prefix-{digest}.md")
+
+    if os.path.exists(prefix_file):
+        return prefix_file
+
+    ensure_dir(prefix_dir)
+    fd, tmp_file = tempfile.mkstemp(dir=prefix_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, prefix_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+    return prefix_file
+
+
+def _build_command(
+    prompt: str,
+    model: str,
+    output_file: Optional[str] = None,
+    skip_perms: bool = False,
+    system_prompt_file: Optional[str] = None,
+) -> List[str]:
+    """Build the Claude Code CLI command."""
+    cmd = [CLAUDE_PATH, "-p", prompt]
+    cmd.extend(["--model", model])
+
+    # Static prefix goes into the system prompt so it forms a cacheable prefix
+    if system_prompt_file:
+        cmd.extend(["--append-system-prompt-file", system_prompt_file])
+
+    # Add dangerous skip permissions flag if enabled
+    if skip_perms:
+        cmd.append("--dangerously-skip-permissions")
+
+    # If output file specified, use stream-json format
+    if output_file:
+        cmd.extend(["--output-format", "stream-json"])
+        cmd.append("--verbose")
+    else:
+        # Simple text output
+        cmd.extend(["--output-format", "text"])
+
+    return cmd
+
+
+# Read size for Claude's stdout pipe when teeing stream-json output
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class _StreamRecorder:
+    """Tee Claude's stream-json stdout to disk while parsing it.
+
+    Raw bytes go to the .jsonl file as they arrive, each complete line is
+    decoded once and appended to the .json array sibling, and the last
+    "result" message is kept, so no second pass over the output is needed.
+    """
+
+    def __init__(self, jsonl_file: str):
+        output_dir = os.path.dirname(jsonl_file)
+        if output_dir:
+            ensure_dir(output_dir)
+
+        self.result_message: Optional[Dict[str, Any]] = None
+        self._pending = bytearray()
+        self._failed = False
+        self._jsonl = open(jsonl_file, "wb")
+        self._json = open(jsonl_file.replace('.jsonl', '.json'), "wb")
+        self._array = ArrayWriter(self._json)
+
+    def write(self, chunk: bytes) -> None:
+        """Record a chunk of stdout; it may end in the middle of a line."""
+        self._jsonl.write(chunk)
+        self._pending += chunk
+        if b"\n" not in chunk:
+            return
+
+        *lines, rest = self._pending.split(b"\n")
+        self._pending = rest
+        for line in lines:
+            self._parse(line)
+
+    def _parse(self, line: bytes) -> None:
+        if self._failed or not line.strip():
+            return
+        try:
+            message = loads(line)
+        except ValueError as e:
+            print(f"Error parsing JSONL output: {e}", file=sys.stderr)
+            self._failed = True
+            self.result_message = None
+            return
+
+        if message.get("type") == "result":
+            self.result_message = message
+        self._array.write(message)
+
+    def close(self) -> None:
+        """Parse any unterminated last line and close both files."""
+        self._parse(self._pending)
+        self._pending = bytearray()
+        self._array.finish()
+        self._json.close()
+        self._jsonl.close()
+
+    def __enter__(self) -> "_StreamRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _stream_json_response(
+    result_message: Optional[Dict[str, Any]], returncode: int, stderr: str
+) -> AgentPromptResponse:
+    """Build the response for a finished stream-json run."""
+    if returncode == 0 and result_message:
+        return AgentPromptResponse(
+            output=result_message.get("result", ""),
+            success=not result_message.get("is_error", False),
+            session_id=result_message.get("session_id"),
+            cost_usd=result_message.get("total_cost_usd"),
+            duration_ms=result_message.get("duration_ms"),
+        )
+
+    return AgentPromptResponse(
+        output=f"Error: {stderr}",
+        success=False,
+    )
+
+
+def _text_response(returncode: int, stdout: str, stderr: str) -> AgentPromptResponse:
+    """Build the response for a finished text-output run."""
+    return AgentPromptResponse(
+        output=stdout.strip() if returncode == 0 else stderr,
+        success=returncode == 0,
+    )
+
+
+def _cache_key(request: AgentPromptRequest, cwd: str) -> Optional[str]:
+    """Content-address a request by prompt, model and repository state.
+
+    Returns:
+        Hex digest, or None when the result must not be cached (caching
+        disabled, not a git repository, or uncommitted changes in cwd
+        outside ADW's own output directory)
+    """
+    if request.cache == "off" or has_changes(cwd, exclude=(ADW_OUTPUT_DIR,)):
+        return None
+
+    head = get_head_sha(cwd)
+    if not head:
+        return None
+
+    key = "|".join((
+        request.prompt, request.model, head, cwd, request.cache_prefix or "",
+        # Runs with and without edit permissions produce different answers
+        "skip-perms" if request.dangerously_skip_permissions else "perms",
+    ))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=32).hexdigest()
+
+
+def _read_cached_response(
+    request: AgentPromptRequest, key: Optional[str]
+) -> Optional[AgentPromptResponse]:
+    """Return the cached response for key if reading is enabled and fresh.
+
+    When the request has an output_file, the raw output recorded with the
+    response is replayed into it (and its .json sibling), so callers find
+    the same files as after a real run. Entries without recorded output
+    count as a miss for such requests.
+    """
+    if not key or request.cache not in ("read", "rw"):
+        return None
+
+    cache_file = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        if time.time() - os.path.getmtime(cache_file) > CACHE_TTL_SECONDS:
+            return None
+        with open(cache_file, "rb") as f:
+            response = AgentPromptResponse.model_validate_json(f.read())
+        if request.output_file:
+            ensure_dir(os.path.dirname(request.output_file) or ".")
+            shutil.copyfile(os.path.join(CACHE_DIR, f"{key}.jsonl"), request.output_file)
+            _convert_jsonl(request.output_file)
+        return response
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_response(
+    request: AgentPromptRequest, key: Optional[str], response: AgentPromptResponse
+) -> None:
+    """Atomically store a successful response if writing is enabled.
+
+    The raw output of requests with an output_file is stored next to it so
+    a later hit can replay it.
+    """
+    if not key or not response.success or request.cache not in ("write", "rw"):
+        return
+
+    try:
+        ensure_dir(CACHE_DIR)
+        if request.output_file:
+            fd, tmp_file = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            os.close(fd)
+            shutil.copyfile(request.output_file, tmp_file)
+            os.replace(tmp_file, os.path.join(CACHE_DIR, f"{key}.jsonl"))
+        fd, tmp_file = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(response.model_dump_json().encode("utf-8"))
+        os.replace(tmp_file, os.path.join(CACHE_DIR, f"{key}.json"))
+    except OSError as e:
+        print(f"Error writing response cache: {e}", file=sys.stderr)
+
+
+def _cache_prefix_file(request: AgentPromptRequest, cwd: str) -> Optional[str]:
+    """Persist the request's cache prefix, if any, and return its path."""
+    if not request.cache_prefix:
+        return None
+    return _write_cache_prefix(request.cache_prefix, request.agent_name, cwd)
+
+
+def _prefix_error(e: OSError) -> AgentPromptResponse:
+    return AgentPromptResponse(
+        output=f"Error writing prompt cache prefix: {e}",
+        success=False,
+    )
+
+
 def execute_prompt(request: AgentPromptRequest) -> AgentPromptResponse:
     """Execute Claude Code with the given prompt configuration.
 
@@ -114,70 +418,81 @@ def execute_prompt(request: AgentPromptRequest) -> AgentPromptResponse:
     Returns:
         AgentPromptResponse with output and status
     """
+    # Determine working directory
+    cwd = request.working_directory or os.getcwd()
+
+    key = _cache_key(request, cwd)
+    cached = _read_cached_response(request, key)
+    if cached:
+        return cached
+
+    try:
+        prefix_file = _cache_prefix_file(request, cwd)
+    except OSError as e:
+        return _prefix_error(e)
+
+    response = _run_claude(
+        request.prompt,
+        request.model,
+        cwd,
+        output_file=request.output_file,
+        skip_perms=request.dangerously_skip_permissions,
+        system_prompt_file=prefix_file,
+    )
+    _write_cached_response(request, key, response)
+    return response
+
+
+def _run_claude(
+    prompt: str,
+    model: str,
+    cwd: str,
+    output_file: Optional[str] = None,
+    skip_perms: bool = False,
+    system_prompt_file: Optional[str] = None,
+) -> AgentPromptResponse:
+    """Run one Claude Code process and build its response."""
     # Check if Claude Code CLI is installed
     error_msg = check_claude_installed()
     if error_msg:
         return AgentPromptResponse(output=error_msg, success=False)
 
-    # Build command
-    cmd = [CLAUDE_PATH, "-p", request.prompt]
-    cmd.extend(["--model", request.model])
-
-    # Add dangerous skip permissions flag if enabled
-    if request.dangerously_skip_permissions:
-        cmd.append("--dangerously-skip-permissions")
-
-    # Determine working directory
-    cwd = request.working_directory or os.getcwd()
+    cmd = _build_command(prompt, model, output_file, skip_perms, system_prompt_file)
 
     # Set up environment
     env = get_claude_env()
 
     try:
-        # If output file specified, use stream-json format
-        if request.output_file:
-            cmd.extend(["--output-format", "stream-json"])
-            cmd.append("--verbose")
-
-            output_dir = os.path.dirname(request.output_file)
-            if output_dir:
-                os.makedirs(output_dir, exist_ok=True)
-
-            with open(request.output_file, "w") as f:
-                result = subprocess.run(
-                    cmd, stdout=f, stderr=subprocess.PIPE, text=True,
+        if output_file:
+            # stderr is spooled to a temp file so a chatty stderr can never
+            # fill its pipe and stall Claude while stdout is being read
+            with _StreamRecorder(output_file) as recorder, \
+                    tempfile.TemporaryFile() as stderr_file:
+                proc = subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=stderr_file,
                     env=env, cwd=cwd
                 )
-
-            if result.returncode == 0:
-                messages, result_message = parse_jsonl_output(request.output_file)
-                convert_jsonl_to_json(request.output_file)
-
-                if result_message:
-                    return AgentPromptResponse(
-                        output=result_message.get("result", ""),
-                        success=not result_message.get("is_error", False),
-                        session_id=result_message.get("session_id"),
-                        cost_usd=result_message.get("total_cost_usd"),
-                        duration_ms=result_message.get("duration_ms"),
-                    )
-
-            return AgentPromptResponse(
-                output=f"Error: {result.stderr}",
-                success=False,
-            )
+                try:
+                    with proc.stdout:
+                        for chunk in iter(lambda: proc.stdout.read1(_STREAM_CHUNK_SIZE), b""):
+                            recorder.write(chunk)
+                    returncode = proc.wait()
+                finally:
+                    # Never leave Claude running in the repo if recording failed
+                    if proc.returncode is None:
+                        proc.kill()
+                        proc.wait()
+
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode(errors="replace")
+
+            return _stream_json_response(recorder.result_message, returncode, stderr)
         else:
-            # Simple text output
-            cmd.extend(["--output-format", "text"])
-
             result = subprocess.run(
                 cmd, capture_output=True, text=True, env=env, cwd=cwd
             )
 
-            return AgentPromptResponse(
-                output=result.stdout.strip() if result.returncode == 0 else result.stderr,
-                success=result.returncode == 0,
-            )
+            return _text_response(result.returncode, result.stdout, result.stderr)
 
     except subprocess.TimeoutExpired:
         return AgentPromptResponse(
@@ -191,33 +506,133 @@ def execute_prompt(request: AgentPromptRequest) -> AgentPromptResponse:
         )
 
 
-def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
-    """Execute a Claude Code template with slash command and arguments.
+async def execute_prompt_async(request: AgentPromptRequest) -> AgentPromptResponse:
+    """Execute Claude Code without blocking the event loop.
+
+    Same behaviour as execute_prompt, but the subprocess is driven by
+    asyncio so many prompts can be awaited together with asyncio.gather.
 
     Args:
-        request: AgentTemplateRequest with command and arguments
+        request: AgentPromptRequest with prompt and configuration
 
     Returns:
         AgentPromptResponse with output and status
     """
+    # Determine working directory
+    cwd = request.working_directory or os.getcwd()
+
+    # Cache lookups and the prefix file are blocking file/git I/O
+    key = await asyncio.to_thread(_cache_key, request, cwd)
+    cached = await asyncio.to_thread(_read_cached_response, request, key)
+    if cached:
+        return cached
+
+    try:
+        prefix_file = await asyncio.to_thread(_cache_prefix_file, request, cwd)
+    except OSError as e:
+        return _prefix_error(e)
+
+    response = await _run_claude_async(
+        request.prompt,
+        request.model,
+        cwd,
+        output_file=request.output_file,
+        skip_perms=request.dangerously_skip_permissions,
+        system_prompt_file=prefix_file,
+    )
+    await asyncio.to_thread(_write_cached_response, request, key, response)
+    return response
+
+
+async def _run_claude_async(
+    prompt: str,
+    model: str,
+    cwd: str,
+    output_file: Optional[str] = None,
+    skip_perms: bool = False,
+    system_prompt_file: Optional[str] = None,
+) -> AgentPromptResponse:
+    """Run one Claude Code process on the event loop and build its response."""
+    # Check if Claude Code CLI is installed (runs `claude --version` once)
+    error_msg = await asyncio.to_thread(check_claude_installed)
+    if error_msg:
+        return AgentPromptResponse(output=error_msg, success=False)
+
+    cmd = _build_command(prompt, model, output_file, skip_perms, system_prompt_file)
+
+    # Set up environment
+    env = get_claude_env()
+
+    try:
+        if output_file:
+            # The recorder writes both output files and decodes/encodes
+            # every line, so all of its work runs on a worker thread
+            recorder = await asyncio.to_thread(_StreamRecorder, output_file)
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE, env=env, cwd=cwd
+                )
+                stderr_task = asyncio.create_task(proc.stderr.read())
+                try:
+                    while chunk := await proc.stdout.read(_STREAM_CHUNK_SIZE):
+                        await asyncio.to_thread(recorder.write, chunk)
+                    stderr = await stderr_task
+                    returncode = await proc.wait()
+                finally:
+                    # Never leave Claude running in the repo if recording
+                    # failed or the coroutine was cancelled
+                    if proc.returncode is None:
+                        proc.kill()
+                        await proc.wait()
+                    stderr_task.cancel()
+            finally:
+                await asyncio.to_thread(recorder.close)
+
+            return _stream_json_response(
+                recorder.result_message, returncode, stderr.decode(errors="replace")
+            )
+        else:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE, env=env, cwd=cwd
+            )
+            try:
+                stdout, stderr = await proc.communicate()
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+
+            return _text_response(proc.returncode, stdout.decode(), stderr.decode())
+
+    except Exception as e:
+        return AgentPromptResponse(
+            output=f"Error executing Claude Code: {e}",
+            success=False,
+        )
+
+
+def _build_template_prompt_request(request: AgentTemplateRequest) -> AgentPromptRequest:
+    """Build the prompt request that executes a template request."""
     # Construct prompt from slash command and args
     prompt = f"{request.slash_command} {' '.join(request.args)}"
 
     # Determine output directory
     if request.working_directory:
-        output_dir = os.path.join(request.working_directory, "agents")
+        output_dir = os.path.join(request.working_directory, ADW_OUTPUT_DIR)
     else:
-        output_dir = os.path.join(os.getcwd(), "agents")
-
-    os.makedirs(output_dir, exist_ok=True)
+        output_dir = os.path.join(os.getcwd(), ADW_OUTPUT_DIR)
 
     # Build output file path
     output_file = os.path.join(
-        output_dir, request.agent_id, request.agent_name, "raw_output.jsonl"
+        _agent_dir(output_dir, request.agent_id, request.agent_name),
+        "raw_output.jsonl",
     )
 
-    # Create prompt request
-    prompt_request = AgentPromptRequest(
+    # Every field comes from the already validated template request, so
+    # skip a second round of pydantic validation
+    return AgentPromptRequest.model_construct(
         prompt=prompt,
         agent_id=request.agent_id,
         agent_name=request.agent_name,
@@ -225,9 +640,70 @@ def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
         dangerously_skip_permissions=True,
         output_file=output_file,
         working_directory=request.working_directory,
+        cache_prefix=request.cache_prefix,
+        cache=request.cache,
     )
 
-    return execute_prompt(prompt_request)
+
+def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
+    """Execute a Claude Code template with slash command and arguments.
+
+    Args:
+        request: AgentTemplateRequest with command and arguments
+
+    Returns:
+        AgentPromptResponse with output and status
+    """
+    return execute_prompt(_build_template_prompt_request(request))
+
+
+def execute_templates_parallel(
+    requests: List[AgentTemplateRequest],
+    max_concurrency: Optional[int] = None,
+) -> List[AgentPromptResponse]:
+    """Execute several templates concurrently, one Claude Code process each.
+
+    Each run writes to its own agents/{agent_id}/{agent_name}/ directory, so
+    requests must not share the same (agent_id, agent_name) pair.
+
+    Args:
+        requests: Template requests to execute
+        max_concurrency: Maximum processes in flight (defaults to MAX_CONCURRENCY)
+
+    Returns:
+        AgentPromptResponses in the same order as the requests
+    """
+    if not requests:
+        return []
+
+    prompt_requests = [_build_template_prompt_request(r) for r in requests]
+    max_workers = min(len(prompt_requests), max_concurrency or MAX_CONCURRENCY)
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        futures = [executor.submit(execute_prompt, r) for r in prompt_requests]
+        return [f.result() for f in futures]
+
+
+async def execute_templates_async(
+    requests: List[AgentTemplateRequest],
+    max_concurrency: Optional[int] = None,
+) -> List[AgentPromptResponse]:
+    """Execute several templates concurrently on the running event loop.
+
+    Args:
+        requests: Template requests to execute
+        max_concurrency: Maximum processes in flight (defaults to MAX_CONCURRENCY)
+
+    Returns:
+        AgentPromptResponses in the same order as the requests
+    """
+    semaphore = asyncio.Semaphore(max(max_concurrency or MAX_CONCURRENCY, 1))
+
+    async def run(request: AgentTemplateRequest) -> AgentPromptResponse:
+        async with semaphore:
+            return await execute_prompt_async(_build_template_prompt_request(request))
+
+    return list(await asyncio.gather(*(run(r) for r in requests)))
 
 
 def execute_simple(
@@ -245,14 +721,6 @@ def execute_simple(
     Returns:
         AgentPromptResponse with output and status
     """
-    from utils import make_adw_id
-
-    request = AgentPromptRequest(
-        prompt=prompt,
-        agent_id=make_adw_id(),
-        agent_name="simple",
-        model=model,
-        working_directory=working_directory,
-    )
-
-    return execute_prompt(request)
+    # One-shot text call: no output file, cache or prefix, so skip building
+    # and validating an AgentPromptRequest
+    return _run_claude(prompt, model, working_directory or os.getcwd())
@@ -45,6 +45,12 @@ class AgentPromptRequest(BaseModel):
     dangerously_skip_permissions: bool = False
     output_file: Optional[str] = None
     working_directory: Optional[str] = None
+    # Static text (system prompt, repo context) sent ahead of the prompt.
+    # Kept byte-identical across runs so Claude's prompt cache can reuse it.
+    cache_prefix: Optional[str] = None
+    # Disk cache of responses keyed by prompt, model and git HEAD of the
+    # working directory; never used while the working tree has changes.
+    cache: Literal["off", "read", "write", "rw"] = "off"
 
 
 class AgentPromptResponse(BaseModel):
@@ -64,6 +70,8 @@ class AgentTemplateRequest(BaseModel):
     agent_id: str
     model: Literal["sonnet", "opus", "haiku"] = "sonnet"
     working_directory: Optional[str] = None
+    cache_prefix: Optional[str] = None
+    cache: Literal["off", "read", "write", "rw"] = "off"
 
 
 class ClaudeCodeResultMessage(BaseModel):
@@ -3,16 +3,32 @@
 import subprocess
 import sys
 import os
-from typing import Optional, Tuple
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+try:
+    import pygit2
+except ImportError:  # optional in-process backend for read-only queries
+    pygit2 = None
+
+# git@host:owner/repo(.git) or http(s)://host/owner/repo(.git), one pass
+_REPO_URL_RE = re.compile(r"^(?:git@[^:]+:|https?://[^/]+/)?(.+?)(?:\.git)?$")
+
+# `git submodule status` line: " <hash> <path> (<branch>)" or "-<hash> <path>"
+_SUBMODULE_STATUS_RE = re.compile(rb"^[ +\-U][0-9a-f]+ (\S+)", re.MULTILINE)
 
 
 def run_git_command(
     args: list,
     cwd: Optional[str] = None,
     capture_output: bool = True,
-) -> Tuple[bool, str, str]:
+) -> Tuple[bool, bytes, bytes]:
     """Run a git command and return (success, stdout, stderr).
 
+    Output is returned as raw bytes; most callers only check success, so
+    decoding is left to the ones that read it (see _decode).
+
     Args:
         args: Git command arguments (without 'git' prefix)
         cwd: Working directory for the command
@@ -21,19 +37,51 @@ def run_git_command(
     Returns:
         Tuple of (success, stdout, stderr)
     """
-    cmd = ["git"] + args
+    # --no-optional-locks keeps read-only commands (status) from taking the
+    # index lock, so concurrent agents on the same repo don't contend
+    cmd = ["git", "--no-optional-locks"]
+    if cwd:
+        cmd.extend(["-C", cwd])
+    cmd.extend(args)
     try:
         result = subprocess.run(
             cmd,
             capture_output=capture_output,
-            text=True,
-            cwd=cwd,
         )
-        return result.returncode == 0, result.stdout.strip(), result.stderr.strip()
+        return result.returncode == 0, result.stdout or b"", result.stderr or b""
     except FileNotFoundError:
-        return False, "", "git command not found"
+        return False, b"", b"git command not found"
     except Exception as e:
-        return False, "", str(e)
+        return False, b"", str(e).encode()
+
+
+def _decode(output: bytes) -> str:
+    """Decode and strip git command output."""
+    return output.decode(errors="replace").strip()
+
+
+@lru_cache(maxsize=32)
+def _open_repo(path: str) -> "pygit2.Repository":
+    """Open (once per path) the repository containing path."""
+    repo_path = pygit2.discover_repository(path)
+    if repo_path is None:
+        raise ValueError(f"Not a git repository: {path}")
+    return pygit2.Repository(repo_path)
+
+
+def _get_repo(cwd: Optional[str]) -> Optional["pygit2.Repository"]:
+    """Return a cached pygit2 handle for cwd, or None to use the git CLI.
+
+    Only read-only queries use this path; anything that writes (staging,
+    committing, checkout) goes through the git CLI so hooks, signing and
+    user config keep working.
+    """
+    if pygit2 is None:
+        return None
+    try:
+        return _open_repo(os.path.abspath(cwd or os.getcwd()))
+    except (ValueError, pygit2.GitError):
+        return None
 
 
 # =============================================================================
@@ -57,8 +105,8 @@ def get_repo_url(cwd: Optional[str] = None) -> str:
         cwd=cwd,
     )
     if not success:
-        raise ValueError(f"Failed to get remote URL: {stderr}")
-    return stdout
+        raise ValueError(f"Failed to get remote URL: {_decode(stderr)}")
+    return _decode(stdout)
 
 
 def extract_repo_path(url: str) -> str:
@@ -69,27 +117,17 @@ def extract_repo_path(url: str) -> str:
     - https://github.com/owner/repo.git
     - git@github.com:owner/repo.git
 
+    Other hosts work the same way; anything else is returned without a
+    trailing .git.
+
     Args:
         url: The git URL
 
     Returns:
         The owner/repo string
     """
-    # Handle SSH URLs
-    if url.startswith("git@"):
-        # git@github.com:owner/repo.git -> owner/repo
-        url = url.split(":")[-1]
-
-    # Handle HTTPS URLs
-    url = url.replace("https://github.com/", "")
-    url = url.replace("https://gitlab.com/", "")
-    url = url.replace("https://bitbucket.org/", "")
-
-    # Remove .git suffix
-    if url.endswith(".git"):
-        url = url[:-4]
-
-    return url
+    match = _REPO_URL_RE.match(url)
+    return match.group(1) if match else url
 
 
 def get_repo_name_from_url(url: str) -> str:
@@ -101,14 +139,60 @@ def get_repo_name_from_url(url: str) -> str:
     Returns:
         The repository name (without owner)
     """
-    repo_path = extract_repo_path(url)
-    return repo_path.split("/")[-1]
+    return extract_repo_path(url).rpartition("/")[2]
 
 
 # =============================================================================
 # Branch Operations
 # =============================================================================
 
+def get_head_sha(cwd: Optional[str] = None) -> Optional[str]:
+    """Get the commit SHA of HEAD.
+
+    Args:
+        cwd: Working directory
+
+    Returns:
+        The full commit SHA, or None if not in a git repo or no commits yet
+    """
+    success, stdout, _ = run_git_command(
+        ["rev-parse", "--verify", "HEAD"],
+        cwd=cwd,
+    )
+    sha = _decode(stdout)
+    return sha if success and sha else None
+
+
+def _head_mtime(cwd: Optional[str]) -> Optional[int]:
+    """Return the mtime of .git/HEAD under cwd, or None if not found.
+
+    HEAD is rewritten on every checkout, so its mtime identifies the
+    current branch. Worktrees and submodules (where .git is a file) and
+    subdirectories of a repo return None and are simply not cached.
+    """
+    try:
+        return os.stat(os.path.join(cwd or os.getcwd(), ".git", "HEAD")).st_mtime_ns
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=128)
+def _cached_current_branch(cwd: str, head_mtime: int) -> str:
+    """Branch lookup memoized per (cwd, HEAD mtime)."""
+    return _read_current_branch(cwd)
+
+
+def _read_current_branch(cwd: Optional[str]) -> str:
+    success, stdout, stderr = run_git_command(
+        ["branch", "--show-current"],
+        cwd=cwd,
+    )
+    branch = _decode(stdout)
+    if not success or not branch:
+        raise ValueError(f"Failed to get current branch: {_decode(stderr)}")
+    return branch
+
+
 def get_current_branch(cwd: Optional[str] = None) -> str:
     """Get the current branch name.
 
@@ -121,13 +205,16 @@ def get_current_branch(cwd: Optional[str] = None) -> str:
     Raises:
         ValueError: If not in a git repo or detached HEAD
     """
-    success, stdout, stderr = run_git_command(
-        ["branch", "--show-current"],
-        cwd=cwd,
-    )
-    if not success or not stdout:
-        raise ValueError(f"Failed to get current branch: {stderr}")
-    return stdout
+    repo = _get_repo(cwd)
+    if repo is not None and not repo.head_is_unborn:
+        if repo.head_is_detached:
+            raise ValueError("Failed to get current branch: HEAD is detached")
+        return repo.head.shorthand
+
+    head_mtime = _head_mtime(cwd)
+    if head_mtime is None:
+        return _read_current_branch(cwd)
+    return _cached_current_branch(os.path.abspath(cwd or os.getcwd()), head_mtime)
 
 
 def create_branch(branch_name: str, cwd: Optional[str] = None) -> bool:
@@ -145,7 +232,7 @@ def create_branch(branch_name: str, cwd: Optional[str] = None) -> bool:
         cwd=cwd,
     )
     if not success:
-        print(f"Error creating branch: {stderr}", file=sys.stderr)
+        print(f"Error creating branch: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -164,7 +251,7 @@ def checkout_branch(branch_name: str, cwd: Optional[str] = None) -> bool:
         cwd=cwd,
     )
     if not success:
-        print(f"Error checking out branch: {stderr}", file=sys.stderr)
+        print(f"Error checking out branch: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -178,6 +265,14 @@ def branch_exists(branch_name: str, cwd: Optional[str] = None) -> bool:
     Returns:
         True if branch exists
     """
+    repo = _get_repo(cwd)
+    if repo is not None:
+        try:
+            repo.revparse_single(branch_name)
+            return True
+        except (KeyError, ValueError, pygit2.GitError):
+            return False
+
     success, _, _ = run_git_command(
         ["rev-parse", "--verify", branch_name],
         cwd=cwd,
@@ -200,7 +295,7 @@ def stage_all(cwd: Optional[str] = None) -> bool:
     """
     success, _, stderr = run_git_command(["add", "-A"], cwd=cwd)
     if not success:
-        print(f"Error staging changes: {stderr}", file=sys.stderr)
+        print(f"Error staging changes: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -216,7 +311,7 @@ def stage_files(files: list, cwd: Optional[str] = None) -> bool:
     """
     success, _, stderr = run_git_command(["add"] + files, cwd=cwd)
     if not success:
-        print(f"Error staging files: {stderr}", file=sys.stderr)
+        print(f"Error staging files: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -235,7 +330,7 @@ def commit(message: str, cwd: Optional[str] = None) -> bool:
         cwd=cwd,
     )
     if not success:
-        print(f"Error committing: {stderr}", file=sys.stderr)
+        print(f"Error committing: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -252,7 +347,7 @@ def get_diff_stat(cwd: Optional[str] = None) -> str:
         ["diff", "--stat", "--cached"],
         cwd=cwd,
     )
-    return stdout if success else ""
+    return _decode(stdout) if success else ""
 
 
 # =============================================================================
@@ -275,7 +370,7 @@ def add_submodule(url: str, path: str, cwd: Optional[str] = None) -> bool:
         cwd=cwd,
     )
     if not success:
-        print(f"Error adding submodule: {stderr}", file=sys.stderr)
+        print(f"Error adding submodule: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -295,7 +390,7 @@ def remove_submodule(path: str, cwd: Optional[str] = None) -> bool:
         cwd=cwd,
     )
     if not success:
-        print(f"Error deinitializing submodule: {stderr}", file=sys.stderr)
+        print(f"Error deinitializing submodule: {_decode(stderr)}", file=sys.stderr)
         return False
 
     # Remove from .git/modules
@@ -304,7 +399,7 @@ def remove_submodule(path: str, cwd: Optional[str] = None) -> bool:
         cwd=cwd,
     )
     if not success:
-        print(f"Error removing submodule: {stderr}", file=sys.stderr)
+        print(f"Error removing submodule: {_decode(stderr)}", file=sys.stderr)
         return False
 
     return True
@@ -324,7 +419,7 @@ def init_submodules(cwd: Optional[str] = None) -> bool:
         cwd=cwd,
     )
     if not success:
-        print(f"Error initializing submodules: {stderr}", file=sys.stderr)
+        print(f"Error initializing submodules: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -341,20 +436,10 @@ def list_submodules(cwd: Optional[str] = None) -> list:
         ["submodule", "status"],
         cwd=cwd,
     )
-    if not success or not stdout:
+    if not success:
         return []
 
-    submodules = []
-    for line in stdout.split("\n"):
-        if line.strip():
-            # Format: " <hash> <path> (<branch>)" or "-<hash> <path>"
-            parts = line.strip().split()
-            if len(parts) >= 2:
-                # The path is the second part (first might be hash with prefix)
-                path = parts[1]
-                submodules.append(path)
-
-    return submodules
+    return [m.group(1).decode() for m in _SUBMODULE_STATUS_RE.finditer(stdout)]
 
 
 # =============================================================================
@@ -387,7 +472,7 @@ def push(
 
     success, _, stderr = run_git_command(args, cwd=cwd)
     if not success:
-        print(f"Error pushing: {stderr}", file=sys.stderr)
+        print(f"Error pushing: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -412,7 +497,7 @@ def pull(
 
     success, _, stderr = run_git_command(args, cwd=cwd)
     if not success:
-        print(f"Error pulling: {stderr}", file=sys.stderr)
+        print(f"Error pulling: {_decode(stderr)}", file=sys.stderr)
     return success
 
 
@@ -430,20 +515,85 @@ def get_status(cwd: Optional[str] = None) -> str:
         Status output
     """
     success, stdout, _ = run_git_command(["status"], cwd=cwd)
-    return stdout if success else ""
+    return _decode(stdout) if success else ""
 
 
-def has_changes(cwd: Optional[str] = None) -> bool:
-    """Check if there are uncommitted changes.
+def get_repo_state(cwd: Optional[str] = None) -> Dict[str, Any]:
+    """Get branch and working tree state with a single git call.
 
     Args:
         cwd: Working directory
 
     Returns:
-        True if there are changes
+        Dict with "branch" (None on detached HEAD), "dirty" (bool) and
+        "files" (paths with staged, unstaged or untracked changes)
+
+    Raises:
+        ValueError: If not in a git repo
     """
-    success, stdout, _ = run_git_command(
-        ["status", "--porcelain"],
+    success, stdout, stderr = run_git_command(
+        ["status", "--porcelain=v2", "--branch", "-z"],
         cwd=cwd,
     )
-    return bool(stdout.strip())
+    if not success:
+        raise ValueError(f"Failed to get repo state: {_decode(stderr)}")
+
+    branch = None
+    files = []
+    entries = iter(stdout.decode(errors="replace").split("\0"))
+    for entry in entries:
+        if entry.startswith("# branch.head "):
+            head = entry[len("# branch.head "):]
+            branch = None if head == "(detached)" else head
+        elif entry.startswith("1 "):
+            files.append(entry.split(" ", 8)[-1])
+        elif entry.startswith("2 "):
+            files.append(entry.split(" ", 9)[-1])
+            next(entries, None)  # Original path of the rename/copy
+        elif entry.startswith("u "):
+            files.append(entry.split(" ", 10)[-1])
+        elif entry.startswith("? "):
+            files.append(entry[2:])
+
+    return {"branch": branch, "dirty": bool(files), "files": files}
+
+
+def has_changes(cwd: Optional[str] = None, exclude: Sequence[str] = ()) -> bool:
+    """Check if there are uncommitted changes.
+
+    Args:
+        cwd: Working directory
+        exclude: Paths relative to cwd whose changes are ignored (e.g. the
+            agents/ directory ADW writes its own output to)
+
+    Returns:
+        True if there are changes
+    """
+    repo = _get_repo(cwd)
+    if repo is not None:
+        status = repo.status()
+        if not exclude:
+            return bool(status)
+        # Status paths are relative to the worktree root, in POSIX form
+        base = os.path.abspath(cwd or os.getcwd())
+        excluded = [
+            os.path.relpath(os.path.join(base, path), repo.workdir).replace(os.sep, "/")
+            for path in exclude
+        ]
+        prefixes = tuple(path + "/" for path in excluded)
+        return any(
+            path not in excluded and not path.startswith(prefixes) for path in status
+        )
+
+    if exclude:
+        success, stdout, _ = run_git_command(
+            ["status", "--porcelain", "-z", "--", ":/"]
+            + [f":(exclude){path}" for path in exclude],
+            cwd=cwd,
+        )
+        return success and bool(stdout)
+
+    try:
+        return get_repo_state(cwd)["dirty"]
+    except ValueError:
+        return False
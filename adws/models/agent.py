@@ -1,13 +1,25 @@
 """Agent model for multi-repo orchestration."""
 
+import copy
 import os
-import json
-from typing import Optional, Dict, Any, List
+import sys
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Optional, Dict, Any, Deque, Iterable, List, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from .serialization import (
+    dump_file, dump_lines_file, dumps_line, ensure_dir, iter_lines_file, load_file, write_bytes,
+)
 
-@dataclass
+# Summary lines kept pre-rendered for get_context_summary
+SUMMARY_MESSAGES = 10
+# Default for AgentConfig.history_limit
+DEFAULT_HISTORY_LIMIT = 1000
+
+
+@dataclass(slots=True)
 class AgentConfig:
     """Configuration for an agent."""
     name: str
@@ -17,6 +29,7 @@ class AgentConfig:
     framework: str = ""
     entry_points: List[str] = field(default_factory=list)
     system_prompt: str = ""
+    history_limit: int = DEFAULT_HISTORY_LIMIT  # Messages kept in memory; disk keeps all (0 = unbounded)
     created_at: datetime = field(default_factory=datetime.now)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -29,6 +42,7 @@ class AgentConfig:
             "framework": self.framework,
             "entry_points": self.entry_points,
             "system_prompt": self.system_prompt,
+            "history_limit": self.history_limit,
             "created_at": self.created_at.isoformat(),
         }
 
@@ -41,39 +55,101 @@ class AgentConfig:
         return cls(**data)
 
 
-@dataclass
+_MESSAGE_KEYS = {"role", "content", "agent_id", "timestamp"}
+
+
+@dataclass(slots=True)
 class Message:
     """A message in a conversation."""
     role: str  # "user", "assistant", "system"
     content: str
     agent_id: Optional[str] = None  # Which agent sent/received this
     timestamp: datetime = field(default_factory=datetime.now)
+    _timestamp_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # Messages are not mutated after creation, so the encoded dict is
+    # computed once and reused by every later save
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def iso_timestamp(self) -> str:
+        """ISO 8601 timestamp, formatted once per message."""
+        if self._timestamp_iso is None:
+            self._timestamp_iso = self.timestamp.isoformat()
+        return self._timestamp_iso
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "role": self.role,
-            "content": self.content,
-            "agent_id": self.agent_id,
-            "timestamp": self.timestamp.isoformat(),
-        }
+        """Convert to dictionary for JSON serialization.
+
+        The returned dict is cached on the message; treat it as read-only.
+        """
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "role": self.role,
+                "content": self.content,
+                "agent_id": self.agent_id,
+                "timestamp": self.iso_timestamp,
+            }
+        return self._cached_dict
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Message":
         """Create from dictionary."""
+        raw = data
         data = data.copy()
+        # Roles and agent names repeat across thousands of messages; share
+        # one string object per distinct value
+        if isinstance(data.get("role"), str):
+            data["role"] = sys.intern(data["role"])
+        if data.get("agent_id"):
+            data["agent_id"] = sys.intern(data["agent_id"])
         if "timestamp" in data and isinstance(data["timestamp"], str):
             data["timestamp"] = datetime.fromisoformat(data["timestamp"])
-        return cls(**data)
+        message = cls(**data)
+        if raw.keys() == _MESSAGE_KEYS and isinstance(raw["timestamp"], str):
+            # Already in to_dict() form: reuse it instead of re-encoding later
+            message._timestamp_iso = raw["timestamp"]
+            message._cached_dict = raw
+        return message
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# Agent.load LRU: (agents_dir, agent_name) -> (file stamps, config data,
+# newest history_limit messages), least recently loaded evicted first
+LOAD_CACHE_SIZE = 32
+_LOAD_CACHE: "OrderedDict[Tuple[str, str], Tuple[Any, Dict[str, Any], Tuple[Message, ...]]]" = OrderedDict()
 
 
 class Agent:
     """An agent that manages a single repository."""
 
+    __slots__ = (
+        "config", "conversation_history", "_session_id", "_summary_lines", "_summary",
+        "_unsaved", "_log_ready",
+    )
+
     def __init__(self, config: AgentConfig):
         self.config = config
-        self.conversation_history: List[Message] = []
+        self.conversation_history: Deque[Message] = deque(maxlen=config.history_limit or None)
         self._session_id: Optional[str] = None
+        # Rendered summary lines for the most recent messages, plus the last
+        # (max_messages, summary) returned by get_context_summary
+        self._summary_lines: Deque[str] = deque(
+            maxlen=min(SUMMARY_MESSAGES, config.history_limit or SUMMARY_MESSAGES)
+        )
+        self._summary: Optional[Tuple[int, str]] = None
+        # Persistence state: history.jsonl holds the full log, messages added
+        # since the last save are appended to it. Until the log is known to
+        # match (fresh or cleared agent), save_history rewrites it instead
+        self._unsaved: List[Message] = []
+        self._log_ready = False
 
     @property
     def name(self) -> str:
@@ -83,73 +159,146 @@ class Agent:
     def repo_path(self) -> str:
         return self.config.repo_path
 
+    @staticmethod
+    def _summary_line(msg: Message) -> str:
+        # Plain concatenation: one attribute read per field, no format calls
+        agent_id = msg.agent_id
+        if agent_id:
+            return "[" + msg.role + " - " + agent_id + "]: " + msg.content[:200] + "..."
+        return "[" + msg.role + "]: " + msg.content[:200] + "..."
+
     def add_message(self, message: Message) -> None:
         """Add a message to conversation history."""
         self.conversation_history.append(message)
+        self._unsaved.append(message)
+        self._summary_lines.append(self._summary_line(message))
+        self._summary = None
+
+    def _set_history(self, messages: Iterable[Message]) -> None:
+        """Replace conversation history, keeping the newest messages."""
+        self.conversation_history.clear()
+        self.conversation_history.extend(messages)
+        self._summary_lines.clear()
+        skip = max(len(self.conversation_history) - self._summary_lines.maxlen, 0)
+        self._summary_lines.extend(
+            self._summary_line(m) for m in islice(self.conversation_history, skip, None)
+        )
+        self._summary = None
 
     def get_context_summary(self, max_messages: int = 10) -> str:
         """Get a summary of recent conversation for context sharing."""
-        recent = self.conversation_history[-max_messages:]
-        if not recent:
+        if not self.conversation_history:
             return "No conversation history."
 
-        summary_parts = []
-        for msg in recent:
-            prefix = f"[{msg.role}]"
-            if msg.agent_id:
-                prefix = f"[{msg.role} - {msg.agent_id}]"
-            summary_parts.append(f"{prefix}: {msg.content[:200]}...")
+        if self._summary is not None and self._summary[0] == max_messages:
+            return self._summary[1]
+
+        if max_messages <= self._summary_lines.maxlen:
+            skip = max(len(self._summary_lines) - max_messages, 0)
+            lines = islice(self._summary_lines, skip, None)
+        else:
+            recent = list(islice(reversed(self.conversation_history), max_messages))
+            lines = (self._summary_line(m) for m in reversed(recent))
 
-        return "\n".join(summary_parts)
+        summary = "\n".join(lines)
+        self._summary = (max_messages, summary)
+        return summary
 
     def clear_history(self) -> None:
-        """Clear conversation history."""
-        self.conversation_history = []
+        """Clear conversation history (on disk too, at the next save)."""
+        self._set_history(())
+        self._unsaved.clear()
+        self._log_ready = False
         self._session_id = None
 
     def save_config(self, agents_dir: str) -> str:
         """Save agent config to disk."""
         agent_dir = os.path.join(agents_dir, self.name)
-        os.makedirs(agent_dir, exist_ok=True)
+        ensure_dir(agent_dir)
 
         config_path = os.path.join(agent_dir, "config.json")
-        with open(config_path, "w") as f:
-            json.dump(self.config.to_dict(), f, indent=2)
+        dump_file(self.config.to_dict(), config_path)
 
         return config_path
 
     def save_history(self, agents_dir: str) -> str:
-        """Save conversation history to disk."""
-        agent_dir = os.path.join(agents_dir, self.name)
-        os.makedirs(agent_dir, exist_ok=True)
+        """Save conversation history to disk.
 
-        history_path = os.path.join(agent_dir, "history.json")
-        history_data = [msg.to_dict() for msg in self.conversation_history]
-        with open(history_path, "w") as f:
-            json.dump(history_data, f, indent=2)
+        The full log lives in history.jsonl, one message per line; only
+        messages added since the last save are appended. Full rewrites and
+        the migration of a legacy history.json are written line by line.
+        """
+        agent_dir = os.path.join(agents_dir, self.name)
+        ensure_dir(agent_dir)
+
+        history_path = os.path.join(agent_dir, "history.jsonl")
+        legacy_path = os.path.join(agent_dir, "history.json")
+        if not self._log_ready:
+            # Fresh or cleared agent: everything it has is unsaved
+            dump_lines_file((m.to_dict() for m in self._unsaved), history_path)
+            if os.path.exists(legacy_path):
+                os.remove(legacy_path)
+            self._log_ready = True
+        else:
+            if not os.path.exists(history_path) and os.path.exists(legacy_path):
+                dump_lines_file(load_file(legacy_path), history_path)
+                os.remove(legacy_path)
+            if self._unsaved:
+                write_bytes(
+                    history_path,
+                    b"".join(dumps_line(m.to_dict()) for m in self._unsaved),
+                    append=True,
+                )
+        self._unsaved.clear()
 
         return history_path
 
     @classmethod
     def load(cls, agents_dir: str, agent_name: str) -> Optional["Agent"]:
-        """Load an agent from disk."""
+        """Load an agent from disk.
+
+        Only the newest history_limit messages are kept in memory; the full
+        log stays on disk. Parsed files of the LOAD_CACHE_SIZE most recently
+        loaded agents are cached and reused while the mtime and size of the
+        files are unchanged; every call still returns a new Agent.
+        """
         config_path = os.path.join(agents_dir, agent_name, "config.json")
+        history_path = os.path.join(agents_dir, agent_name, "history.jsonl")
+        legacy_path = os.path.join(agents_dir, agent_name, "history.json")
 
-        if not os.path.exists(config_path):
+        config_stamp = _file_stamp(config_path)
+        if config_stamp is None:
             return None
 
-        with open(config_path, "r") as f:
-            config_data = json.load(f)
-
-        config = AgentConfig.from_dict(config_data)
-        agent = cls(config)
-
-        # Load history if exists
-        history_path = os.path.join(agents_dir, agent_name, "history.json")
-        if os.path.exists(history_path):
-            with open(history_path, "r") as f:
-                history_data = json.load(f)
-            agent.conversation_history = [Message.from_dict(m) for m in history_data]
+        history_stamp = _file_stamp(history_path)
+        legacy_stamp = _file_stamp(legacy_path) if history_stamp is None else None
+        stamp = (config_stamp, history_stamp, legacy_stamp)
+        key = (os.path.abspath(agents_dir), agent_name)
+
+        cached = _LOAD_CACHE.get(key)
+        if cached is None or cached[0] != stamp:
+            config_data = load_file(config_path)
+            limit = config_data.get("history_limit", DEFAULT_HISTORY_LIMIT) or None
+            history: Tuple[Message, ...] = ()
+            # Load history if exists, decoding only the messages that are kept
+            if history_stamp is not None:
+                recent = deque(iter_lines_file(history_path), maxlen=limit)
+                history = tuple(Message.from_dict(m) for m in recent)
+            elif legacy_stamp is not None:
+                recent = load_file(legacy_path)
+                if limit:
+                    recent = recent[-limit:]
+                history = tuple(Message.from_dict(m) for m in recent)
+            cached = (stamp, config_data, history)
+            _LOAD_CACHE[key] = cached
+            if len(_LOAD_CACHE) > LOAD_CACHE_SIZE:
+                _LOAD_CACHE.popitem(last=False)
+        _LOAD_CACHE.move_to_end(key)
+
+        _, config_data, history = cached
+        agent = cls(AgentConfig.from_dict(copy.deepcopy(config_data)))
+        agent._set_history(history)
+        agent._log_ready = True
 
         return agent
 
@@ -1,14 +1,23 @@
 """Conversation model for multi-agent interactions."""
 
+import io
 import os
-import json
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field
-from datetime import datetime
+import time
+from collections import deque
+from itertools import islice
+from typing import List, Dict, Any, Deque, Optional, Set
+from dataclasses import InitVar, dataclass, field
+from datetime import datetime, tzinfo
 from .agent import Message
+from .serialization import dump_file, dumps_line, ensure_dir, iter_lines_file, load_file, write_bytes
 
+# Messages kept in the in-memory tail used for agent prompt context
+RECENT_MESSAGES = 50
+# Characters of each message shown to an agent joining a conversation
+CONTEXT_PREVIEW_CHARS = 300
 
-@dataclass
+
+@dataclass(slots=True)
 class Conversation:
     """A conversation that can involve multiple agents."""
 
@@ -16,14 +25,53 @@ class Conversation:
     participants: List[str] = field(default_factory=list)  # Agent names
     messages: List[Message] = field(default_factory=list)
     created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    # Accepted by __init__ (defaults to now); read it back through the
+    # updated_at property defined below the class
+    updated_at: InitVar[Optional[datetime]] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Last-modified time as a POSIX timestamp plus the tzinfo of the value
+    # it was set from, so aware datetimes round-trip
+    _updated_at_ts: float = field(default=0.0, init=False, repr=False)
+    _updated_at_tz: Optional[tzinfo] = field(default=None, init=False, repr=False, compare=False)
+    # Mirror of participants for O(1) membership checks
+    _participant_set: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    # Most recent messages, maintained by add_message, so prompt context
+    # never has to slice the full message list
+    _recent_tail: Deque[Message] = field(
+        default_factory=lambda: deque(maxlen=RECENT_MESSAGES),
+        init=False, repr=False, compare=False,
+    )
+    # One shared string per distinct message content. Messages are never
+    # removed, so the pool only holds strings the messages already keep alive
+    _content_pool: Dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Persistence state: whether the on-disk message log matches
+    # messages[:_saved_count], so later saves can just append
+    _log_ready: bool = field(default=False, init=False, repr=False, compare=False)
+    _saved_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self, updated_at: Optional[datetime]) -> None:
+        if updated_at is None:
+            self._updated_at_ts = time.time()
+        else:
+            self._set_updated_at(updated_at)
+        self._participant_set = set(self.participants)
+        for message in self.messages:
+            self._share_content(message)
+        self._recent_tail.extend(self.messages[-RECENT_MESSAGES:])
+
+    def _get_updated_at(self) -> datetime:
+        """When the conversation was last modified."""
+        return datetime.fromtimestamp(self._updated_at_ts, self._updated_at_tz)
+
+    def _set_updated_at(self, value: datetime) -> None:
+        self._updated_at_ts = value.timestamp()
+        self._updated_at_tz = value.tzinfo
 
     def add_participant(self, agent_name: str, context_summary: str = "") -> None:
         """Add an agent to the conversation."""
-        if agent_name not in self.participants:
+        if agent_name not in self._participant_set:
             self.participants.append(agent_name)
-            self.updated_at = datetime.now()
+            self._participant_set.add(agent_name)
 
             # Add system message about agent joining
             if context_summary:
@@ -41,9 +89,9 @@ class Conversation:
 
     def remove_participant(self, agent_name: str) -> None:
         """Remove an agent from the conversation."""
-        if agent_name in self.participants:
+        if agent_name in self._participant_set:
             self.participants.remove(agent_name)
-            self.updated_at = datetime.now()
+            self._participant_set.discard(agent_name)
 
             self.add_message(Message(
                 role="system",
@@ -51,15 +99,42 @@ class Conversation:
                 agent_id=agent_name,
             ))
 
+    def _share_content(self, message: Message) -> None:
+        """Point message.content at the pooled copy of an equal string."""
+        content = self._content_pool.setdefault(message.content, message.content)
+        if content is not message.content:
+            message.content = content
+            if message._cached_dict is not None:
+                message._cached_dict["content"] = content
+
+    def has_participant(self, agent_name: str) -> bool:
+        """Check whether an agent is part of the conversation."""
+        return agent_name in self._participant_set
+
     def add_message(self, message: Message) -> None:
         """Add a message to the conversation."""
+        self._share_content(message)
         self.messages.append(message)
-        self.updated_at = datetime.now()
+        self._recent_tail.append(message)
+        self._updated_at_ts = time.time()
 
     def get_messages_for_agent(self, agent_name: str, limit: int = 50) -> List[Message]:
-        """Get messages relevant to a specific agent."""
+        """Get messages relevant to a specific agent.
+
+        When the whole conversation fits in limit, the message list itself is
+        returned rather than a copy; callers must not modify it.
+        """
         # Return recent messages, could be filtered further based on agent context
-        return self.messages[-limit:]
+        messages = self.messages
+        if len(messages) <= limit:
+            return messages
+        if not 0 < limit <= RECENT_MESSAGES:
+            return messages[-limit:]
+        if limit >= len(self._recent_tail):
+            return list(self._recent_tail)
+        recent = list(islice(reversed(self._recent_tail), limit))
+        recent.reverse()
+        return recent
 
     def get_context_for_new_participant(self, max_messages: int = 20) -> str:
         """Generate context summary for a new participant joining."""
@@ -67,34 +142,43 @@ class Conversation:
         if not recent:
             return "This is a new conversation with no history."
 
-        summary_parts = [
-            f"Conversation started: {self.created_at.isoformat()}",
-            f"Current participants: {', '.join(self.participants)}",
-            "",
-            "Recent messages:",
-        ]
+        buf = io.StringIO()
+        buf.write("Conversation started: ")
+        buf.write(self.created_at.isoformat())
+        buf.write("\nCurrent participants: ")
+        buf.write(", ".join(self.participants))
+        buf.write("\n\nRecent messages:")
 
         for msg in recent:
-            prefix = f"[{msg.role}]"
-            if msg.agent_id:
-                prefix = f"[{msg.agent_id}]"
+            buf.write("\n[")
+            buf.write(msg.agent_id or msg.role)
+            buf.write("]: ")
             # Truncate long messages
-            content = msg.content[:300] + "..." if len(msg.content) > 300 else msg.content
-            summary_parts.append(f"{prefix}: {content}")
+            content = msg.content
+            if len(content) > CONTEXT_PREVIEW_CHARS:
+                buf.write(content[:CONTEXT_PREVIEW_CHARS])
+                buf.write("...")
+            else:
+                buf.write(content)
 
-        return "\n".join(summary_parts)
+        return buf.getvalue()
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+    def _meta_dict(self) -> Dict[str, Any]:
+        """Everything but the messages, stored in {id}.meta.json."""
         return {
             "id": self.id,
             "participants": self.participants,
-            "messages": [m.to_dict() for m in self.messages],
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "metadata": self.metadata,
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        data = self._meta_dict()
+        data["messages"] = [m.to_dict() for m in self.messages]
+        return data
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Conversation":
         """Create from dictionary."""
@@ -108,24 +192,75 @@ class Conversation:
         return cls(**data)
 
     def save(self, conversations_dir: str) -> str:
-        """Save conversation to disk."""
-        os.makedirs(conversations_dir, exist_ok=True)
-        filepath = os.path.join(conversations_dir, f"{self.id}.json")
-        with open(filepath, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        """Save the full conversation to disk, compacting the message log.
+
+        Messages go to {id}.jsonl (one per line) and everything else to
+        {id}.meta.json. A legacy {id}.json file is removed once migrated.
+        """
+        ensure_dir(conversations_dir)
+        log_path = os.path.join(conversations_dir, f"{self.id}.jsonl")
+        write_bytes(log_path, b"".join(dumps_line(m.to_dict()) for m in self.messages))
+
+        filepath = os.path.join(conversations_dir, f"{self.id}.meta.json")
+        dump_file(self._meta_dict(), filepath)
+
+        legacy_path = os.path.join(conversations_dir, f"{self.id}.json")
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+
+        self._log_ready = True
+        self._saved_count = len(self.messages)
+        return filepath
+
+    def save_append(self, conversations_dir: str) -> str:
+        """Append messages added since the last save and refresh metadata.
+
+        Costs O(new messages) instead of rewriting the whole log. Falls back
+        to a full save() if there is no log for this conversation yet.
+        """
+        if not self._log_ready:
+            return self.save(conversations_dir)
+
+        log_path = os.path.join(conversations_dir, f"{self.id}.jsonl")
+        new_messages = self.messages[self._saved_count:]
+        if new_messages:
+            write_bytes(
+                log_path,
+                b"".join(dumps_line(m.to_dict()) for m in new_messages),
+                append=True,
+            )
+        self._saved_count = len(self.messages)
+
+        filepath = os.path.join(conversations_dir, f"{self.id}.meta.json")
+        dump_file(self._meta_dict(), filepath)
         return filepath
 
     @classmethod
     def load(cls, conversations_dir: str, conversation_id: str) -> Optional["Conversation"]:
         """Load conversation from disk."""
+        meta_path = os.path.join(conversations_dir, f"{conversation_id}.meta.json")
+        if os.path.exists(meta_path):
+            data = load_file(meta_path)
+            log_path = os.path.join(conversations_dir, f"{conversation_id}.jsonl")
+            if os.path.exists(log_path):
+                data["messages"] = iter_lines_file(log_path)
+
+            conversation = cls.from_dict(data)
+            conversation._log_ready = True
+            conversation._saved_count = len(conversation.messages)
+            return conversation
+
+        # Conversations saved before the JSONL log was introduced
         filepath = os.path.join(conversations_dir, f"{conversation_id}.json")
         if not os.path.exists(filepath):
             return None
 
-        with open(filepath, "r") as f:
-            data = json.load(f)
-
-        return cls.from_dict(data)
+        return cls.from_dict(load_file(filepath))
 
     def __repr__(self) -> str:
         return f"Conversation(id={self.id}, participants={self.participants}, messages={len(self.messages)})"
+
+
+# Set after the dataclass is built: a property in the class body would be
+# taken as the default of the updated_at InitVar
+Conversation.updated_at = property(Conversation._get_updated_at, Conversation._set_updated_at)
@@ -0,0 +1,131 @@
+"""JSON encoding and file helpers shared by the ADW models.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+Encoded documents are always UTF-8 bytes so callers can write them in
+binary mode without an intermediate str.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, BinaryIO, Iterable, Iterator, Set, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Directories already created (or found) by ensure_dir in this process
+_ensured_dirs: Set[str] = set()
+
+
+def ensure_dir(path: str) -> None:
+    """os.makedirs(path, exist_ok=True), done at most once per path.
+
+    Directories are assumed to outlive the process, so later calls for the
+    same path skip the mkdir/stat syscalls entirely. makedirs with
+    exist_ok is race-free, and set.add is atomic, so no lock is needed.
+    """
+    if path in _ensured_dirs:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(path)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as an indented (2 spaces) JSON document."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Encode obj as one compact JSON line (newline-terminated), for JSONL."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def load_file(path: str) -> Any:
+    """Read and decode a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_bytes(path: str, data: bytes, append: bool = False) -> None:
+    """Write data to path with raw os.write calls, bypassing buffered io.
+
+    The file is truncated first unless append is set, in which case it is
+    opened with O_APPEND so the data lands at the end in one write.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write less than asked for
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def dump_file(obj: Any, path: str) -> None:
+    """Encode obj and write it to path, replacing any existing file."""
+    write_bytes(path, dumps(obj))
+
+
+def dump_lines_file(items: Iterable[Any], path: str) -> None:
+    """Write items to path as JSONL, encoding and writing one line at a time.
+
+    The lines go to a temp file that replaces path once complete, so the
+    whole document never sits in memory and a crash cannot leave a
+    truncated file behind.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for item in items:
+                f.write(dumps_line(item))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def iter_lines_file(path: str) -> Iterator[Any]:
+    """Decode a JSONL file lazily, one line at a time."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+class ArrayWriter:
+    """Write a JSON array to an open binary file one item at a time.
+
+    Produces the same layout as dump_file(list_of_items, path) without
+    building the list or the full document in memory. finish() writes the
+    closing bracket; the file itself is left open.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._first = True
+        f.write(b"[")
+
+    def write(self, item: Any) -> None:
+        self._f.write(b"\n  " if self._first else b",\n  ")
+        self._f.write(dumps(item).replace(b"\n", b"\n  "))
+        self._first = False
+
+    def finish(self) -> None:
+        self._f.write(b"]" if self._first else b"\n]")
+
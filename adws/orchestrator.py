@@ -1,17 +1,21 @@
 """Orchestrator for multi-repo agent coordination."""
 
+import io
 import os
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
 from models import Agent, AgentConfig, Message, Conversation
-from agent import execute_prompt, execute_template, execute_simple
+from models.serialization import ensure_dir
+from agent import MAX_CONCURRENCY, execute_prompt, execute_template, execute_simple
 from data_types import AgentPromptRequest, AgentPromptResponse, AgentTemplateRequest
 from utils import make_adw_id
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentResponse:
     """Response from an agent execution."""
     agent_name: str
@@ -20,6 +24,23 @@ class AgentResponse:
     session_id: Optional[str] = None
 
 
+def _is_agent_dir_name(name: str) -> bool:
+    """Whether name can only refer to a directory directly inside agents/."""
+    if name in ("", ".", ".."):
+        return False
+    return os.sep not in name and not (os.altsep and os.altsep in name)
+
+
+@lru_cache(maxsize=256)
+def _agent_not_found(agent_name: str) -> AgentResponse:
+    """Failure response for an unknown agent (immutable, so shared)."""
+    return AgentResponse(
+        agent_name=agent_name,
+        content=f"Agent '{agent_name}' not found",
+        success=False,
+    )
+
+
 class Orchestrator:
     """Central coordinator for multi-repo agents."""
 
@@ -35,28 +56,44 @@ class Orchestrator:
         self.conversations_dir = os.path.join(project_root, "conversations")
 
         # Ensure directories exist
-        os.makedirs(self.repos_dir, exist_ok=True)
-        os.makedirs(self.agents_dir, exist_ok=True)
-        os.makedirs(self.conversations_dir, exist_ok=True)
+        ensure_dir(self.repos_dir)
+        ensure_dir(self.agents_dir)
+        ensure_dir(self.conversations_dir)
 
-        # In-memory registries
+        # In-memory registries. Agents are loaded from disk on first use;
+        # unregistered names stay hidden even though their files remain
         self._agents: Dict[str, Agent] = {}
+        self._unregistered: Set[str] = set()
+        self._agents_scanned = False
         self._conversations: Dict[str, Conversation] = {}
 
-        # Load existing agents
-        self._load_agents()
+        # Name snapshots for list_agents/get_status, rebuilt only after the
+        # registries change (None = stale)
+        self._agent_names: Optional[Tuple[str, ...]] = None
+        self._conversation_names: Optional[Tuple[str, ...]] = None
 
     def _load_agents(self) -> None:
-        """Load all agents from disk."""
-        if not os.path.exists(self.agents_dir):
-            return
+        """Load all agents from disk that are not in memory yet.
 
-        for agent_name in os.listdir(self.agents_dir):
-            agent_path = os.path.join(self.agents_dir, agent_name)
-            if os.path.isdir(agent_path):
-                agent = Agent.load(self.agents_dir, agent_name)
-                if agent:
-                    self._agents[agent_name] = agent
+        The directory is scanned once; after that the registry is kept
+        current by register_agent and get_agent.
+        """
+        if self._agents_scanned or not os.path.exists(self.agents_dir):
+            return
+        self._agents_scanned = True
+        self._agent_names = None
+
+        # scandir reports entry types from the directory listing itself,
+        # so only symlinked entries cost a stat()
+        with os.scandir(self.agents_dir) as entries:
+            for entry in entries:
+                agent_name = entry.name
+                if agent_name in self._agents or agent_name in self._unregistered:
+                    continue
+                if entry.is_dir():
+                    agent = Agent.load(self.agents_dir, agent_name)
+                    if agent:
+                        self._agents[agent_name] = agent
 
     # =========================================================================
     # Agent Management
@@ -74,6 +111,8 @@ class Orchestrator:
         agent = Agent(config)
         agent.save_config(self.agents_dir)
         self._agents[agent.name] = agent
+        self._unregistered.discard(agent.name)
+        self._agent_names = None
         return agent
 
     def unregister_agent(self, agent_name: str) -> bool:
@@ -85,22 +124,44 @@ class Orchestrator:
         Returns:
             True if agent was removed, False if not found
         """
-        if agent_name in self._agents:
+        if self.get_agent(agent_name):
             del self._agents[agent_name]
             # Note: doesn't delete files, just removes from registry
+            self._unregistered.add(agent_name)
+            self._agent_names = None
             return True
         return False
 
     def get_agent(self, agent_name: str) -> Optional[Agent]:
-        """Get an agent by name."""
-        return self._agents.get(agent_name)
+        """Get an agent by name, loading it from disk on first access."""
+        agent = self._agents.get(agent_name)
+        if agent is None and agent_name not in self._unregistered:
+            # Names come from API input; only ever load a direct child of
+            # agents/ whose config agrees on the name
+            if not _is_agent_dir_name(agent_name):
+                return None
+            if os.path.isdir(os.path.join(self.agents_dir, agent_name)):
+                agent = Agent.load(self.agents_dir, agent_name)
+                if agent is None or agent.name != agent_name:
+                    return None
+                self._agents[agent_name] = agent
+                self._agent_names = None
+        return agent
 
     def list_agents(self) -> List[str]:
         """List all registered agent names."""
-        return list(self._agents.keys())
+        return list(self._agent_name_snapshot())
+
+    def _agent_name_snapshot(self) -> Tuple[str, ...]:
+        """Registered agent names, cached until the registry changes."""
+        self._load_agents()
+        if self._agent_names is None:
+            self._agent_names = tuple(self._agents)
+        return self._agent_names
 
     def get_all_agents(self) -> Dict[str, Agent]:
         """Get all registered agents."""
+        self._load_agents()
         return self._agents.copy()
 
     # =========================================================================
@@ -126,6 +187,7 @@ class Orchestrator:
 
         conversation.save(self.conversations_dir)
         self._conversations[conversation_id] = conversation
+        self._conversation_names = None
         return conversation
 
     def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
@@ -138,6 +200,7 @@ class Orchestrator:
         conversation = Conversation.load(self.conversations_dir, conversation_id)
         if conversation:
             self._conversations[conversation_id] = conversation
+            self._conversation_names = None
 
         return conversation
 
@@ -160,7 +223,7 @@ class Orchestrator:
         # Get context summary for the new participant
         context = conversation.get_context_for_new_participant()
         conversation.add_participant(agent_name, context)
-        conversation.save(self.conversations_dir)
+        conversation.save_append(self.conversations_dir)
 
         return True
 
@@ -171,7 +234,7 @@ class Orchestrator:
             return False
 
         conversation.remove_participant(agent_name)
-        conversation.save(self.conversations_dir)
+        conversation.save_append(self.conversations_dir)
         return True
 
     # =========================================================================
@@ -189,10 +252,11 @@ class Orchestrator:
         Args:
             conversation_id: ID of the conversation
             message: The message content
-            target_agents: Specific agents to target (None = all participants)
+            target_agents: Specific agents to target (None = all participants).
+                An agent named more than once is still called only once.
 
         Returns:
-            List of responses from each targeted agent
+            List of responses, one per distinct targeted agent
         """
         conversation = self.get_conversation(conversation_id)
         if not conversation:
@@ -202,40 +266,80 @@ class Orchestrator:
         user_message = Message(role="user", content=message)
         conversation.add_message(user_message)
 
-        # Determine which agents to target
-        agents_to_call = target_agents or conversation.participants
-
-        responses = []
-        for agent_name in agents_to_call:
-            if agent_name not in conversation.participants:
-                continue
-
-            agent = self.get_agent(agent_name)
-            if not agent:
-                continue
-
-            # Execute Claude command for this agent
-            response = self._execute_agent(agent, conversation, message)
-            responses.append(response)
-
+        # Resolve targeted agents once, before any of them run
+        agents = self._resolve_targets(conversation, target_agents)
+
+        # Execute Claude commands, concurrently when more than one agent is
+        # targeted. Every agent sees the same context; results are applied
+        # in call order once all have finished
+        if len(agents) == 1:
+            responses = [self._execute_agent(agents[0], conversation, message)]
+        elif agents:
+            max_workers = min(len(agents), MAX_CONCURRENCY)
+            with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+                futures = [
+                    executor.submit(self._execute_agent, agent, conversation, message)
+                    for agent in agents
+                ]
+                responses = [future.result() for future in futures]
+        else:
+            responses = []
+
+        # Only agents that got a new message need their history rewritten
+        dirty: List[Agent] = []
+        for agent, response in zip(agents, responses):
             # Add agent response to conversation
             if response.success:
                 agent_message = Message(
                     role="assistant",
                     content=response.content,
-                    agent_id=agent_name,
+                    agent_id=agent.name,
                 )
                 conversation.add_message(agent_message)
                 agent.add_message(agent_message)
+                dirty.append(agent)
 
         # Save updated state
-        conversation.save(self.conversations_dir)
-        for agent_name in agents_to_call:
+        self._save_state(conversation, dirty)
+
+        return responses
+
+    def _resolve_targets(
+        self,
+        conversation: Conversation,
+        target_agents: Optional[List[str]],
+    ) -> List[Agent]:
+        """Resolve the agents a message goes to.
+
+        Args:
+            conversation: The conversation the message belongs to
+            target_agents: Specific agents to target (None = all participants)
+
+        Returns:
+            Registered participant agents in target order, without duplicates
+        """
+        agents: List[Agent] = []
+        seen: Set[str] = set()
+        for agent_name in target_agents or conversation.participants:
+            if agent_name in seen or not conversation.has_participant(agent_name):
+                continue
+            seen.add(agent_name)
+
             agent = self.get_agent(agent_name)
             if agent:
-                agent.save_history(self.agents_dir)
+                agents.append(agent)
+        return agents
 
-        return responses
+    def _save_state(self, conversation: Conversation, agents: Iterable[Agent]) -> None:
+        """Persist a conversation and the agents changed during a turn.
+
+        Each file is written once per turn, and only for agents whose history
+        gained a message; the conversation log only gets the new messages
+        appended.
+        """
+        conversation.save_append(self.conversations_dir)
+        for agent in agents:
+            agent.save_history(self.agents_dir)
 
     def _execute_agent(
         self,
@@ -256,7 +360,7 @@ class Orchestrator:
             AgentResponse with the result
         """
         # Build context from conversation history
-        context_messages = conversation.get_messages_for_agent(agent.name)
+        context_messages = conversation.get_messages_for_agent(agent.name, limit=10)
 
         # Build the full prompt with context
         full_prompt = self._build_prompt(agent, context_messages, prompt)
@@ -285,38 +389,48 @@ class Orchestrator:
 
         Args:
             agent: The agent being invoked
-            context_messages: Recent conversation messages
+            context_messages: Recent conversation messages, all of which are included
             user_prompt: The current user prompt
 
         Returns:
             The full prompt string
         """
-        parts = []
+        buf = io.StringIO()
 
         # Add agent system prompt if exists
         if agent.config.system_prompt:
-            parts.append(f"System: {agent.config.system_prompt}")
-            parts.append("")
+            buf.write("System: ")
+            buf.write(agent.config.system_prompt)
+            buf.write("\n\n")
 
         # Add agent context
-        parts.append(f"You are an agent for the '{agent.name}' repository.")
-        parts.append(f"Repository path: {agent.repo_path}")
+        buf.write("You are an agent for the '")
+        buf.write(agent.name)
+        buf.write("' repository.\nRepository path: ")
+        buf.write(agent.repo_path)
+        buf.write("\n")
         if agent.config.description:
-            parts.append(f"Repository description: {agent.config.description}")
-        parts.append("")
+            buf.write("Repository description: ")
+            buf.write(agent.config.description)
+            buf.write("\n")
+        buf.write("\n")
 
         # Add conversation context
         if context_messages:
-            parts.append("Recent conversation context:")
-            for msg in context_messages[-10:]:  # Last 10 messages
-                prefix = msg.agent_id if msg.agent_id else msg.role
-                parts.append(f"[{prefix}]: {msg.content}")
-            parts.append("")
+            buf.write("Recent conversation context:\n")
+            for msg in context_messages:
+                buf.write("[")
+                buf.write(msg.agent_id or msg.role)
+                buf.write("]: ")
+                buf.write(msg.content)
+                buf.write("\n")
+            buf.write("\n")
 
         # Add the current prompt
-        parts.append(f"User: {user_prompt}")
+        buf.write("User: ")
+        buf.write(user_prompt)
 
-        return "\n".join(parts)
+        return buf.getvalue()
 
     # =========================================================================
     # Direct Agent Execution (outside conversation)
@@ -342,11 +456,7 @@ class Orchestrator:
         """
         agent = self.get_agent(agent_name)
         if not agent:
-            return AgentResponse(
-                agent_name=agent_name,
-                content=f"Agent '{agent_name}' not found",
-                success=False,
-            )
+            return _agent_not_found(agent_name)
 
         # Build prompt from command and args
         prompt = command
@@ -449,11 +559,7 @@ class Orchestrator:
         """
         agent = self.get_agent(agent_name)
         if not agent:
-            return AgentResponse(
-                agent_name=agent_name,
-                content=f"Agent '{agent_name}' not found",
-                success=False,
-            )
+            return _agent_not_found(agent_name)
 
         # Step 1: Classify the task
         command = self.classify_task(agent_name, task_description, classifier_model)
@@ -555,11 +661,14 @@ class Orchestrator:
 
     def get_status(self) -> Dict:
         """Get orchestrator status."""
+        agents = self._agent_name_snapshot()
+        if self._conversation_names is None:
+            self._conversation_names = tuple(self._conversations)
         return {
             "project_root": self.project_root,
-            "agents_count": len(self._agents),
-            "agents": list(self._agents.keys()),
-            "conversations_count": len(self._conversations),
-            "conversations": list(self._conversations.keys()),
+            "agents_count": len(agents),
+            "agents": agents,
+            "conversations_count": len(self._conversation_names),
+            "conversations": self._conversation_names,
             "valid_commands": self.VALID_COMMANDS,
         }